@@ -1,12 +1,24 @@
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-class Settings:
-    OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
-    MAX_FILE_SIZE: int = 100 * 1024 * 1024  # 100MB
-    TEMP_DIR: str = "temp_files"
-    ALLOWED_VIDEO_FORMATS: list = [".mp4", ".avi", ".mov", ".mkv", ".webm", ".flv"]
-
-settings = Settings() 
\ No newline at end of file
+import os
+from dataclasses import dataclass, field
+
+# Environment loading (.env) is the entry point's job (see main.py); this
+# module only reads whatever is already in os.environ, so importing it stays
+# free of filesystem work.
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    # Maximum number of OpenAI requests in flight at once
+    OPENAI_CONCURRENCY: int = int(os.getenv("OPENAI_CONCURRENCY", "16"))
+    # Whisper checkpoint for transcription; the distilled English model has
+    # a much shallower decoder than whisper-small at similar accuracy. Set
+    # to e.g. "small" for multilingual audio.
+    WHISPER_MODEL: str = os.getenv("WHISPER_MODEL", "distil-small.en")
+    MAX_FILE_SIZE: int = 100 * 1024 * 1024  # 100MB
+    TEMP_DIR: str = "temp_files"
+    # frozenset so extension checks are O(1) hash lookups
+    ALLOWED_VIDEO_FORMATS: frozenset = field(
+        default_factory=lambda: frozenset({".mp4", ".avi", ".mov", ".mkv", ".webm", ".flv"})
+    )
+
+settings = Settings()
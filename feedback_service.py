@@ -1,566 +1,1135 @@
+import ahocorasick
+import asyncio
+import copy
+import hashlib
 import json
 import logging
-from typing import Dict, Any, List
-from langchain.chat_models import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
+import msgspec
+import os
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple
+from pydantic import ValidationError
 from config import settings
+from models import Feedback
 
 logger = logging.getLogger(__name__)
 
+# JSON Schema for the emit_feedback tool. Shipping the schema as a function
+# spec instead of prompt text keeps the huge inline example out of the prompt
+# entirely and lets OpenAI enforce the structure server-side.
+_RATING_SCHEMA = {"type": "integer", "minimum": 1, "maximum": 5}
+_LEVEL_SCHEMA = {"type": "string", "enum": ["high", "medium", "low"]}
+_STRING_LIST_SCHEMA = {"type": "array", "items": {"type": "string"}}
+
+_FEEDBACK_TOOL_PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "overall_sentiment": {"type": "string", "enum": ["positive", "neutral", "negative"]},
+        "key_topics": {
+            **_STRING_LIST_SCHEMA,
+            "description": "Key topics discussed in the interview"
+        },
+        "summary": {"type": "string", "description": "Concise summary of the interview"},
+        "recommendations": {
+            **_STRING_LIST_SCHEMA,
+            "description": "Actionable suggestions for improvement"
+        },
+        "quality_score": {**_RATING_SCHEMA, "description": "Overall content quality rating"},
+        "word_count": {"type": "integer", "description": "Total number of words in the transcript"},
+        "content_analysis": {
+            "type": "object",
+            "properties": {
+                "clarity": _LEVEL_SCHEMA,
+                "engagement": _LEVEL_SCHEMA,
+                "information_density": _LEVEL_SCHEMA,
+                "speaker_confidence": _LEVEL_SCHEMA
+            },
+            "required": ["clarity", "engagement", "information_density", "speaker_confidence"]
+        },
+        "speaking_patterns": {
+            "type": "object",
+            "properties": {
+                "pace": {"type": "string", "enum": ["fast", "medium", "slow"]},
+                "filler_words": {**_RATING_SCHEMA, "description": "Frequency of filler word usage"},
+                "repetitions": {**_RATING_SCHEMA, "description": "Frequency of repeated content"},
+                "technical_terms": {
+                    **_STRING_LIST_SCHEMA,
+                    "description": "Notable technical terms used"
+                }
+            },
+            "required": ["pace", "filler_words", "repetitions", "technical_terms"]
+        },
+        "actionable_insights": {
+            **_STRING_LIST_SCHEMA,
+            "description": "Observations with practical takeaways"
+        },
+        "questions": {
+            "type": "array",
+            "description": "Every question and answer from the interview transcript",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "question": {"type": "string", "description": "Interview question"},
+                    "answer": {"type": "string", "description": "Candidate's response"},
+                    "rating": {**_RATING_SCHEMA, "description": "Answer quality rating"},
+                    "feedback": {"type": "string", "description": "Constructive feedback on the answer"}
+                },
+                "required": ["question", "answer", "rating", "feedback"]
+            }
+        },
+        "communication_skills": {
+            "type": "object",
+            "properties": {
+                "summary": {"type": "string", "description": "Overview of communication abilities"},
+                "impact": {"type": "string", "description": "Collaboration or team impact"},
+                "rating": _RATING_SCHEMA,
+                "language_fluency": _RATING_SCHEMA,
+                "technical_articulation": _RATING_SCHEMA
+            },
+            "required": ["summary", "impact", "rating", "language_fluency", "technical_articulation"]
+        },
+        "technical_skills": {
+            "type": "object",
+            "properties": {
+                "skills": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "skill_name": {"type": "string", "description": "e.g. '.NET Core', 'AWS', 'C#'"},
+                            "level": {"type": "string", "enum": ["Beginner", "Intermediate", "Professional", "Expert"]},
+                            "rating_text": {"type": "string", "enum": ["Excellent", "Very Good", "Good", "Satisfactory", "Needs Improvement"]},
+                            "rating_score": {**_RATING_SCHEMA, "description": "Numerical rating"},
+                            "detailed_feedback": {"type": "string", "description": "Comprehensive professional assessment of the skill"},
+                            "strengths": {
+                                **_STRING_LIST_SCHEMA,
+                                "description": "Specific strengths demonstrated"
+                            },
+                            "areas_for_improvement": {
+                                **_STRING_LIST_SCHEMA,
+                                "description": "Areas needing work"
+                            },
+                            "examples_mentioned": {
+                                **_STRING_LIST_SCHEMA,
+                                "description": "Specific examples or concepts mentioned"
+                            },
+                            "is_required": {"type": "boolean", "description": "Whether this skill was specified as required"},
+                            "availability_status": {"type": "string", "enum": ["Available", "Not Available"]}
+                        },
+                        "required": ["skill_name", "rating_score", "strengths", "areas_for_improvement", "examples_mentioned"]
+                    }
+                },
+                "required_skills": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "name": {"type": "string", "description": "Name of the required skill"}
+                        },
+                        "required": ["name"]
+                    }
+                },
+                "overall_tech_review": {"type": "string", "description": "Summary of technical performance"},
+                "depth_in_core_topics": _RATING_SCHEMA,
+                "breadth_of_tech_stack": _RATING_SCHEMA,
+                "strengths_summary": {"type": "string", "description": "Overall technical strengths"},
+                "weaknesses_summary": {"type": "string", "description": "Overall technical weaknesses"},
+                "verdict": {"type": "string", "description": "Final recommendation and assessment"}
+            },
+            "required": ["skills", "overall_tech_review", "depth_in_core_topics", "breadth_of_tech_stack", "strengths_summary", "weaknesses_summary", "verdict"]
+        },
+        "interviewer_notes": {"type": "string", "description": "Observations and any final comments"},
+        "confidence_level": _RATING_SCHEMA,
+        "culture_fit": _RATING_SCHEMA,
+        "learning_aptitude": _RATING_SCHEMA,
+        "final_assessment": {"type": "string", "description": "Overall evaluation and recommendation"}
+    },
+    "required": [
+        "overall_sentiment", "key_topics", "summary", "recommendations",
+        "quality_score", "word_count", "content_analysis", "speaking_patterns",
+        "actionable_insights", "questions", "communication_skills",
+        "technical_skills", "interviewer_notes", "confidence_level",
+        "culture_fit", "learning_aptitude", "final_assessment"
+    ]
+}
+
+_FEEDBACK_TOOLS = [{
+    "type": "function",
+    "function": {
+        "name": "emit_feedback",
+        "description": "Record the complete structured feedback for an interview transcription",
+        "parameters": _FEEDBACK_TOOL_PARAMETERS
+    }
+}]
+
+_FEEDBACK_TOOL_CHOICE = {"type": "function", "function": {"name": "emit_feedback"}}
+
+# Sharded tool specs for the parallel async path: the question/communication
+# fields and the technical-assessment fields are independent, so the async
+# path can request them as two smaller generations and merge the results.
+_QUESTION_SHARD_FIELDS = ("questions", "communication_skills", "speaking_patterns")
+
+
+def _tool_shard(field_names) -> List[Dict[str, Any]]:
+    """Build an emit_feedback tool spec restricted to a subset of fields"""
+    names = set(field_names)
+    return [{
+        "type": "function",
+        "function": {
+            "name": "emit_feedback",
+            "description": _FEEDBACK_TOOLS[0]["function"]["description"],
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    name: schema
+                    for name, schema in _FEEDBACK_TOOL_PARAMETERS["properties"].items()
+                    if name in names
+                },
+                "required": [
+                    name for name in _FEEDBACK_TOOL_PARAMETERS["required"]
+                    if name in names
+                ]
+            }
+        }
+    }]
+
+
+_QUESTION_SHARD_TOOLS = _tool_shard(_QUESTION_SHARD_FIELDS)
+_TECH_SHARD_TOOLS = _tool_shard(
+    name for name in _FEEDBACK_TOOL_PARAMETERS["properties"]
+    if name not in _QUESTION_SHARD_FIELDS
+)
+
+# Static system prompt. Everything here is identical on every call, so it
+# forms a stable prefix that OpenAI's automatic prompt caching can reuse
+# across requests; per-call content (required skills, transcription) is
+# appended in separate messages after it. The output structure itself lives
+# in the emit_feedback tool spec, not in prompt text.
+_PROMPT_TEXT = """You are an expert technical interviewer and feedback analyst specializing in comprehensive technical assessments.
+
+Your task is to analyze the provided interview transcription and generate detailed feedback that includes:
+1. Extract all main technical skills mentioned in the transcript
+2. For each skill, provide detailed feedback similar to a professional technical assessment
+3. Include specific ratings, strengths, areas for improvement, and examples mentioned
+4. Provide an overall technical summary with strengths, weaknesses, and final verdict
+5. Extract all questions and answers from the interview transcript and provide feedback on them
+
+Additionally, you may be given a list of specific required skills to evaluate.
+
+For each required skill:
+- Check if the skill is mentioned or discussed in the interview
+- If available, provide a detailed assessment with level, rating, and feedback
+- If not available, mark it as "Not Available" and set availability_status to "Not Available"
+- Set is_required to true for all required skills
+
+Focus on:
+- Identifying specific technologies, frameworks, or technical concepts discussed
+- Assessing the depth of knowledge demonstrated for each skill
+- Providing constructive, professional feedback
+- Rating skills on both numerical (1-5) and text scales (Excellent, Very Good, Good, Satisfactory, Needs Improvement)
+- Including specific examples or concepts mentioned by the candidate
+- Evaluating the candidate's ability to discuss the skill in detail
+- Evaluating the candidate's ability to apply the skill in a practical way
+- Evaluating the candidate's ability to discuss the skill in a way that is clear and concise
+- Evaluating the candidate's ability to discuss the skill in a way that is accurate and correct
+- Evaluating the candidate's ability to discuss the skill in a way that is consistent with the skill's definition
+- Evaluating the candidate's ability to discuss the skill in a way that is consistent with the skill's best practices
+- Evaluating the candidate's ability to discuss the skill in a way that is consistent with the skill's industry standards
+
+Ensure all ratings are integers from 1-5.
+
+Record your complete assessment by calling the emit_feedback tool with every field populated."""
+
+# Prompt for the optional gpt-4o polish pass over the free-text fields
+_POLISH_PROMPT = """You are an expert technical interviewer. Rewrite the provided assessment fields to be clearer and more professional without changing their substance or conclusions. Respond with a JSON object using the same keys."""
+
+# Dynamic per-request system message, kept out of the static prefix above so
+# the prefix stays byte-identical (and cacheable) across requests.
+_REQUIRED_SKILLS_TEXT = """Evaluate the following specific required skills in this interview:
+{required_skills_list}"""
+
+# C-implemented decoder for the per-request LLM response parse
+_JSON_DECODER = msgspec.json.Decoder(dict)
+
+# Token budget for the transcript portion of the prompt; transcripts over
+# this are clamped instead of being sent to a completion that would only
+# overflow the context window and drop to the fallback.
+_MAX_PROMPT_TOKENS = 6000
+
+
+@lru_cache(maxsize=1)
+def _gpt_encoding():
+    """Cached tiktoken encoding, shared across service instances"""
+    # Lazy so the module stays importable without tiktoken loaded up front
+    import tiktoken
+    return tiktoken.encoding_for_model("gpt-4o")
+
+
+def _truncate_to_budget(text: str) -> str:
+    """Clamp a transcript to the prompt token budget
+
+    Counting with the cached encoding runs in native code and is negligible
+    next to the LLM call it can save.
+    """
+    encoding = _gpt_encoding()
+    tokens = encoding.encode(text)
+    if len(tokens) <= _MAX_PROMPT_TOKENS:
+        return text
+    logger.warning(
+        "Transcript is %d tokens; truncating to %d for the feedback prompt",
+        len(tokens), _MAX_PROMPT_TOKENS
+    )
+    return encoding.decode(tokens[:_MAX_PROMPT_TOKENS])
+
+# Maximum number of cached feedback responses kept per service instance
+_FEEDBACK_CACHE_SIZE = 512
+
+# Minimum cosine similarity for a semantic cache hit
+_SEMANTIC_SIM_THRESHOLD = 0.95
+
+# Matches one word; used to count words without materializing a list of them
+_WORD_RE = re.compile(r'\S+')
+
+# Tech vocabulary scanned for on the fallback path
+_COMMON_TECH_TERMS = [
+    '.net', 'c#', 'java', 'python', 'javascript', 'react', 'angular', 'vue',
+    'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'aws', 'azure', 'gcp',
+    'docker', 'kubernetes', 'microservices', 'api', 'rest', 'graphql',
+    'node.js', 'express', 'spring', 'django', 'flask', 'laravel'
+]
+
+# Aho-Corasick automaton built once at import; a single DFA pass over the
+# transcript replaces one substring search per vocabulary term.
+_TECH_TERMS_AUTOMATON = ahocorasick.Automaton()
+for _term in _COMMON_TECH_TERMS:
+    _TECH_TERMS_AUTOMATON.add_word(_term, _term)
+_TECH_TERMS_AUTOMATON.make_automaton()
+
+
+def _count_words(text: str) -> int:
+    """Count whitespace-separated words without allocating a word list"""
+    return sum(1 for _ in _WORD_RE.finditer(text))
+
+
+# Sentence templates and static fragments for fallback skill entries;
+# formatted per detected term instead of rebuilding every string and dict
+# literal inline.
+_SKILL_FEEDBACK_TMPL = "The candidate demonstrated familiarity with {t} concepts and showed practical understanding. Their discussion covered relevant aspects of {t} technology, indicating a solid foundation with room for growth in advanced topics."
+_SKILL_STRENGTH_TMPL = "Basic to intermediate understanding of {t}"
+_SKILL_IMPROVEMENT_TMPL = "Could provide more specific examples of {t} usage"
+_SKILL_STATIC_STRENGTHS = (
+    "Able to discuss practical applications",
+    "Shows awareness of common patterns and practices"
+)
+_SKILL_STATIC_IMPROVEMENTS = (
+    "Deeper technical details would strengthen responses",
+    "More discussion of best practices and optimization"
+)
+
+# Generic entry used when no technical terms were detected at all
+_GENERIC_SKILL_ENTRY = {
+    "skill_name": "General Technical Knowledge",
+    "level": "Intermediate",
+    "rating_text": "Satisfactory",
+    "rating_score": 3,
+    "detailed_feedback": "The candidate participated in a technical discussion and demonstrated general understanding of software development concepts. While specific technical expertise wasn't clearly evident in the transcript, they showed engagement with technical topics.",
+    "strengths": [
+        "Engaged in technical discussion",
+        "Showed willingness to tackle technical problems",
+        "Demonstrated analytical thinking"
+    ],
+    "areas_for_improvement": [
+        "More specific technical examples would be beneficial",
+        "Deeper dive into chosen technologies",
+        "Stronger articulation of technical concepts"
+    ],
+    "examples_mentioned": ["Software development", "Problem solving"],
+    "is_required": False
+}
+
+
+def _make_skill_entry(term: str, is_required: bool = False) -> Dict[str, Any]:
+    """Build a fallback skill entry for a term detected in the transcript"""
+    entry = {
+        "skill_name": term,
+        "level": "Professional",
+        "rating_text": "Good",
+        "rating_score": 3,
+        "detailed_feedback": _SKILL_FEEDBACK_TMPL.format(t=term),
+        "strengths": [_SKILL_STRENGTH_TMPL.format(t=term), *_SKILL_STATIC_STRENGTHS],
+        "areas_for_improvement": [_SKILL_IMPROVEMENT_TMPL.format(t=term), *_SKILL_STATIC_IMPROVEMENTS],
+        "examples_mentioned": [term],
+        "is_required": is_required
+    }
+    if is_required:
+        entry["availability_status"] = "Available"
+    return entry
+
+
+def _make_unavailable_skill_entry(skill_name: str) -> Dict[str, Any]:
+    """Build the entry for a required skill absent from the transcript"""
+    return {
+        "skill_name": skill_name,
+        "is_required": True,
+        "availability_status": "Not Available",
+        "rating_score": 0,
+        "strengths": [],
+        "areas_for_improvement": [],
+        "examples_mentioned": []
+    }
+
+
+# Static portion of the fallback feedback payload. _get_fallback_feedback
+# deep-copies this template and fills in the per-call fields instead of
+# rebuilding ~30 dict/list literals on every failure path.
+_FALLBACK_TEMPLATE = {
+    "overall_sentiment": "neutral",
+    "key_topics": [],
+    "summary": "",
+    "recommendations": [
+        "Provide more detailed technical examples in future interviews",
+        "Practice articulating complex technical concepts clearly",
+        "Prepare specific use cases and implementation details"
+    ],
+    "quality_score": 3,
+    "word_count": 0,
+    "content_analysis": {
+        "clarity": "medium",
+        "engagement": "medium",
+        "information_density": "medium",
+        "speaker_confidence": "medium"
+    },
+    "speaking_patterns": {
+        "pace": "medium",
+        "filler_words": 2,
+        "repetitions": 1,
+        "technical_terms": []
+    },
+    "actionable_insights": [],
+    "questions": [
+        {
+            "question": "Technical competency assessment",
+            "answer": "Candidate demonstrated baseline technical knowledge with room for growth",
+            "rating": 3,
+            "feedback": "Technical understanding appears solid with opportunities to demonstrate deeper expertise"
+        }
+    ],
+    "communication_skills": {
+        "summary": "Clear communication with adequate technical articulation",
+        "impact": "Would likely contribute effectively to technical team discussions",
+        "rating": 3,
+        "language_fluency": 4,
+        "technical_articulation": 3
+    },
+    "technical_skills": {},
+    "interviewer_notes": "",
+    "confidence_level": 3,
+    "culture_fit": 3,
+    "learning_aptitude": 4,
+    "final_assessment": "Recommended for technical roles. The candidate demonstrated solid baseline technical knowledge with clear potential for growth. Their engagement with technical topics and analytical approach suggest they would be successful in collaborative development environments."
+}
+
+
+def _cache_key(transcription_text: str, required_skills: List[str]) -> Tuple[str, Tuple[str, ...]]:
+    """Build a cache key from a transcription hash and the required skills"""
+    digest = hashlib.blake2b(transcription_text.encode("utf-8"), digest_size=16).hexdigest()
+    return (digest, tuple(required_skills))
+
+
 class FeedbackService:
     def __init__(self):
         """Initialize OpenAI model for feedback analysis"""
-        logger.info("Initializing OpenAI model for feedback analysis...")
+        # Imported lazily so processes that import this module but never
+        # build the service (e.g. transcription-only workers) don't pay the
+        # multi-second LangChain/pydantic import cost.
+        import httpx
+        from langchain_openai import ChatOpenAI
+        from openai import APIConnectionError, APITimeoutError, RateLimitError
+        from tenacity import (
+            retry,
+            retry_if_exception_type,
+            stop_after_attempt,
+            wait_random_exponential,
+        )
+
+        logger.info("Initializing OpenAI models for feedback analysis...")
+        # One pooled HTTP client pair shared by every model and the embedding
+        # client, so TCP+TLS handshakes and DNS lookups are paid once per
+        # connection instead of once per ChatOpenAI instance.
+        limits = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+        self._http_client = httpx.Client(limits=limits)
+        self._http_async_client = httpx.AsyncClient(limits=limits)
+        # The bulk structured draft runs on gpt-4o-mini; gpt-4o is reserved
+        # for the optional refine_feedback_text pass, so most tokens are
+        # served by the much cheaper, faster model.
         self.llm = ChatOpenAI(
-            model="gpt-4",
+            model="gpt-4o-mini",
+            temperature=0.7,
+            openai_api_key=settings.OPENAI_API_KEY,
+            http_client=self._http_client,
+            http_async_client=self._http_async_client,
+            model_kwargs={"tools": _FEEDBACK_TOOLS, "tool_choice": _FEEDBACK_TOOL_CHOICE}
+        )
+        # Full gpt-4o draft model for transcripts too long or skill-heavy
+        # for the mini model to assess reliably (see _route_llm)
+        self.llm_big = ChatOpenAI(
+            model="gpt-4o",
+            temperature=0.7,
+            openai_api_key=settings.OPENAI_API_KEY,
+            http_client=self._http_client,
+            http_async_client=self._http_async_client,
+            model_kwargs={"tools": _FEEDBACK_TOOLS, "tool_choice": _FEEDBACK_TOOL_CHOICE}
+        )
+        self.llm_synth = ChatOpenAI(
+            model="gpt-4o",
             temperature=0.7,
-            openai_api_key=settings.OPENAI_API_KEY
+            openai_api_key=settings.OPENAI_API_KEY,
+            http_client=self._http_client,
+            http_async_client=self._http_async_client,
+            model_kwargs={"response_format": {"type": "json_object"}}
+        )
+        # The system prefix is fully static now that the schema travels in
+        # the tool spec; per-call messages are built directly instead of
+        # going through LangChain's template formatter.
+        self._system_prefix = _PROMPT_TEXT
+        # LRU cache of validated feedback keyed by transcription hash +
+        # required skills; identical re-runs skip the OpenAI call entirely.
+        self._response_cache = OrderedDict()
+        # Gate async calls so bulk evaluation stays under the rate limit
+        self._sem = asyncio.Semaphore(settings.OPENAI_CONCURRENCY)
+        # Semantic cache tier: normalized transcript embeddings pointing at
+        # _response_cache keys, so near-duplicate transcripts also hit
+        self._semantic_index = []
+        self._embedding_client = None
+        self._async_embedding_client = None
+        # Transient failures (429s, timeouts, dropped connections) get a few
+        # jittered retries before the degraded fallback output is considered;
+        # anything else still surfaces immediately.
+        retrying = retry(
+            reraise=True,
+            stop=stop_after_attempt(3),
+            wait=wait_random_exponential(min=1, max=10),
+            retry=retry_if_exception_type((RateLimitError, APITimeoutError, APIConnectionError)),
         )
+
+        def _invoke(llm, messages, **kwargs):
+            return llm.invoke(messages, **kwargs)
+
+        async def _ainvoke(llm, messages, **kwargs):
+            return await llm.ainvoke(messages, **kwargs)
+
+        self._invoke = retrying(_invoke)
+        self._ainvoke = retrying(_ainvoke)
         logger.info("OpenAI model initialized successfully")
 
+    async def aclose(self):
+        """Release the pooled HTTP connections (call on application shutdown)"""
+        await self._http_async_client.aclose()
+        self._http_client.close()
+
+    def _cache_lookup(self, key) -> Dict[str, Any]:
+        """Return a copy of the cached feedback for key, or None on miss"""
+        cached = self._response_cache.get(key)
+        if cached is None:
+            return None
+        self._response_cache.move_to_end(key)
+        return copy.deepcopy(cached)
+
+    def _cache_store(self, key, feedback: Dict[str, Any]):
+        """Store validated feedback, evicting the least recently used entry"""
+        self._response_cache[key] = copy.deepcopy(feedback)
+        self._response_cache.move_to_end(key)
+        if len(self._response_cache) > _FEEDBACK_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+
+    def _try_embed(self, text: str):
+        """Embed text for the semantic cache, or None if embedding fails"""
+        try:
+            import numpy as np
+            from openai import OpenAI
+
+            if self._embedding_client is None:
+                self._embedding_client = OpenAI(
+                    api_key=settings.OPENAI_API_KEY,
+                    http_client=self._http_client
+                )
+            response = self._embedding_client.embeddings.create(
+                model="text-embedding-3-small",
+                input=text[:32000]
+            )
+            vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            return vector / norm if norm else None
+        except Exception as e:
+            logger.warning("Embedding for semantic cache failed: %s", str(e))
+            return None
+
+    async def _atry_embed(self, text: str):
+        """Async variant of _try_embed, sharing the pooled async HTTP client"""
+        try:
+            import numpy as np
+            from openai import AsyncOpenAI
+
+            if self._async_embedding_client is None:
+                self._async_embedding_client = AsyncOpenAI(
+                    api_key=settings.OPENAI_API_KEY,
+                    http_client=self._http_async_client
+                )
+            response = await self._async_embedding_client.embeddings.create(
+                model="text-embedding-3-small",
+                input=text[:32000]
+            )
+            vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            return vector / norm if norm else None
+        except Exception as e:
+            logger.warning("Embedding for semantic cache failed: %s", str(e))
+            return None
+
+    def _semantic_lookup(self, vector, required_skills: List[str]) -> Dict[str, Any]:
+        """Return cached feedback for a near-duplicate transcript, or None"""
+        skills_key = tuple(required_skills)
+        best_key = None
+        best_sim = _SEMANTIC_SIM_THRESHOLD
+        for stored_vector, key in self._semantic_index:
+            if key[1] != skills_key:
+                continue
+            sim = float(stored_vector @ vector)
+            if sim >= best_sim:
+                best_sim = sim
+                best_key = key
+        if best_key is None:
+            return None
+        cached = self._cache_lookup(best_key)
+        if cached is not None:
+            logger.info("Semantic cache hit (similarity %.3f)", best_sim)
+        return cached
+
+    def _semantic_store(self, vector, key):
+        """Index an embedding for a freshly cached response"""
+        self._semantic_index.append((vector, key))
+        if len(self._semantic_index) > _FEEDBACK_CACHE_SIZE:
+            self._semantic_index.pop(0)
+
+    def _route_llm(self, transcription_text: str, required_skills: List[str]):
+        """Pick the draft model for this workload's size
+
+        Short transcripts with a handful of required skills are handled fine
+        by gpt-4o-mini at a fraction of the cost and latency; long or
+        skill-heavy evaluations route to full gpt-4o. Token count is
+        estimated at ~4 characters per token, which is accurate enough for a
+        routing decision.
+        """
+        estimated_tokens = len(transcription_text) // 4
+        if estimated_tokens < 1500 and len(required_skills) <= 3:
+            return self.llm
+        return self.llm_big
+
+    def _build_messages(self, transcription_text: str, required_skills: List[str]) -> List[Any]:
+        """Build the chat messages for a single transcription"""
+        # Lazy for the same reason as ChatOpenAI in __init__; after the first
+        # call this is a cheap sys.modules lookup.
+        from langchain_core.messages import HumanMessage, SystemMessage
+        # Clamp oversized transcripts before they can blow the context window
+        transcription_text = _truncate_to_budget(transcription_text)
+        # Format the required skills as a readable list for the prompt
+        required_skills_formatted = "None specified" if not required_skills else "\n".join([f"- {skill}" for skill in required_skills])
+
+        # Static prefix first, then the per-call required skills and transcription
+        return [
+            SystemMessage(content=self._system_prefix),
+            SystemMessage(content=_REQUIRED_SKILLS_TEXT.format(
+                required_skills_list=required_skills_formatted
+            )),
+            HumanMessage(content=f"Here's the interview transcription to analyze:\n\n{transcription_text}")
+        ]
+
+    def _extract_feedback_payload(self, response) -> Dict[str, Any]:
+        """Pull the feedback dict out of a forced tool call
+
+        Falls back to decoding plain JSON content for responses that arrive
+        without a tool call (e.g. reassembled streams), handling both the
+        bare payload and the legacy {"feedback": {...}} wrapper.
+        """
+        # Typed field first: langchain-openai 1.x puts tool calls only on
+        # AIMessage.tool_calls, with the arguments already parsed into a dict
+        tool_calls = getattr(response, "tool_calls", None) or []
+        if tool_calls:
+            return tool_calls[0]["args"]
+
+        # 0.x additionally mirrors the raw provider payload (arguments as a
+        # JSON string) into additional_kwargs; keep reading it for responses
+        # built that way
+        raw_tool_calls = response.additional_kwargs.get("tool_calls") or []
+        if raw_tool_calls:
+            return _JSON_DECODER.decode(raw_tool_calls[0]["function"]["arguments"])
+
+        feedback_data = _JSON_DECODER.decode(response.content)
+        if 'feedback' in feedback_data and isinstance(feedback_data['feedback'], dict):
+            return feedback_data['feedback']
+        return feedback_data
+
+    def _parse_response(self, response, transcription_text: str, required_skills: List[str], cache_key=None) -> Dict[str, Any]:
+        """Parse and validate a model response, using the fallback on failure"""
+        try:
+            feedback = self._extract_feedback_payload(response)
+            return self._finalize_payload(feedback, transcription_text, required_skills, cache_key=cache_key)
+        except (msgspec.DecodeError, ValidationError) as e:
+            logger.error("Failed to parse or validate response: %s", e)
+            logger.info("Using enhanced fallback feedback due to JSON parsing/validation error")
+            return self._get_fallback_feedback(transcription_text, required_skills)
+
+    def _finalize_payload(self, feedback, transcription_text: str, required_skills: List[str], cache_key=None) -> Dict[str, Any]:
+        """Merge required skills into a decoded payload, validate and cache it
+
+        Raises ValidationError to the caller if the payload is malformed.
+        """
+        # Check if we have the expected structure
+        if isinstance(feedback, dict):
+
+            # Add required skills to the technical_skills section if they're not already there
+            if 'technical_skills' in feedback:
+                if 'skills' not in feedback['technical_skills']:
+                    feedback['technical_skills']['skills'] = []
+
+                # Add required_skills section if it doesn't exist
+                if 'required_skills' not in feedback['technical_skills']:
+                    feedback['technical_skills']['required_skills'] = []
+
+                # Index returned skills by lowercased name once so each
+                # required skill below is a dict lookup, not a list scan
+                skills_by_name = {
+                    skill.get('skill_name', '').lower(): skill
+                    for skill in feedback['technical_skills']['skills']
+                }
+
+                # Add each required skill to the required_skills list
+                for skill_name in required_skills:
+                    existing = skills_by_name.get(skill_name.lower())
+                    if existing is not None:
+                        # Mark existing skill as required
+                        existing['is_required'] = True
+                        if 'availability_status' not in existing:
+                            existing['availability_status'] = 'Available'
+                    else:
+                        # Skill wasn't found in the skills list, add it as not available
+                        entry = _make_unavailable_skill_entry(skill_name)
+                        feedback['technical_skills']['skills'].append(entry)
+                        skills_by_name[skill_name.lower()] = entry
+
+                    # Add to required_skills list
+                    feedback['technical_skills']['required_skills'].append({
+                        'name': skill_name
+                    })
+
+                # Validate the assembled feedback in pydantic-core so
+                # malformed model output never reaches callers
+                validated = Feedback.model_validate(feedback)
+                result = validated.model_dump()
+
+                # Only fully validated responses are worth caching;
+                # fallback output is never stored
+                if cache_key is not None:
+                    self._cache_store(cache_key, result)
+
+                logger.info("Successfully generated enhanced technical skills feedback with required skills evaluation")
+                return result
+            else:
+                logger.warning("Response missing technical_skills structure")
+        else:
+            logger.warning("Response did not contain the expected feedback structure")
+
+        # If we get here, the response wasn't properly formatted
+        logger.info("Using enhanced fallback feedback due to response format issues")
+        return self._get_fallback_feedback(transcription_text, required_skills)
+
     def generate_feedback(self, transcription_text: str, required_skills: List[str] = None) -> Dict[str, Any]:
         """Generate comprehensive feedback based on transcription using OpenAI"""
         try:
             logger.info("Generating feedback using OpenAI...")
-            
+
             # Default to empty list if required_skills is None
             if required_skills is None:
                 required_skills = []
-                
+
             # Log the required skills
-            if required_skills:
-                logger.info(f"Required skills to evaluate: {', '.join(required_skills)}")
-
-            # Enhanced JSON schema for technical skills assessment
-            schema = {
-                "feedback": {
-                    "overall_sentiment": "positive | neutral | negative",
-                    "key_topics": ["string - Key topics discussed in the interview"],
-                    "summary": "string - Concise summary of the interview",
-                    "recommendations": [
-                        "string - Actionable suggestions for improvement"
-                    ],
-                    "quality_score": "integer (1-5) - Overall content quality rating",
-                    "word_count": "integer - Total number of words in the transcript",
-                    "content_analysis": {
-                        "clarity": "high | medium | low",
-                        "engagement": "high | medium | low",
-                        "information_density": "high | medium | low",
-                        "speaker_confidence": "high | medium | low"
-                    },
-                    "speaking_patterns": {
-                        "pace": "fast | medium | slow",
-                        "filler_words": "integer (1-5) - Frequency of filler word usage",
-                        "repetitions": "integer (1-5) - Frequency of repeated content",
-                        "technical_terms": ["string - Notable technical terms used"]
-                    },
-                    "actionable_insights": [
-                        "string - Observations with practical takeaways"
-                    ],
-                    "questions": [
-                        {
-                            "question": "string - Interview question",
-                            "answer": "string - Candidate's response",
-                            "rating": "integer (1-5) - Answer quality rating",
-                            "feedback": "string - Constructive feedback on the answer"
-                        }
-                    ],
-                    "communication_skills": {
-                        "summary": "string - Overview of communication abilities",
-                        "impact": "string - Collaboration or team impact",
-                        "rating": "integer (1-5)",
-                        "language_fluency": "integer (1-5)",
-                        "technical_articulation": "integer (1-5)"
-                    },
-                    "technical_skills": {
-                        "skills": [
-                            {
-                                "skill_name": "string - e.g., '.NET Core', 'AWS', 'C#'",
-                                "level": "Beginner | Intermediate | Professional | Expert",
-                                "rating_text": "Excellent | Very Good | Good | Satisfactory | Needs Improvement",
-                                "rating_score": "integer (1-5) - Numerical rating",
-                                "detailed_feedback": "string - Comprehensive feedback like the example",
-                                "strengths": ["string - Specific strengths demonstrated"],
-                                "areas_for_improvement": ["string - Areas needing work"],
-                                "examples_mentioned": ["string - Specific examples or concepts mentioned"],
-                                "is_required": "boolean - Whether this skill was specified as required",
-                                "availability_status": "string - 'Available' or 'Not Available' in the transcript"
-                            }
-                        ],
-                        "required_skills": [
-                            {
-                                "name": "string - Name of the required skill"
-                            }
-                        ],
-                        "overall_tech_review": "string - Summary of technical performance",
-                        "depth_in_core_topics": "integer (1-5)",
-                        "breadth_of_tech_stack": "integer (1-5)",
-                        "strengths_summary": "string - Overall technical strengths",
-                        "weaknesses_summary": "string - Overall technical weaknesses",
-                        "verdict": "string - Final recommendation and assessment"
-                    },
-                    "interviewer_notes": "string - Observations and any final comments",
-                    "confidence_level": "integer (1-5)",
-                    "culture_fit": "integer (1-5)",
-                    "learning_aptitude": "integer (1-5)",
-                    "final_assessment": "string - Overall evaluation and recommendation"
-                }
-            }
+            if required_skills and logger.isEnabledFor(logging.INFO):
+                logger.info("Required skills to evaluate: %s", ", ".join(required_skills))
 
-            # Enhanced example matching the provided format
-            example = {
-                "feedback": {
-                    "overall_sentiment": "positive",
-                    "key_topics": [".NET Core", "AWS", "C#", "Web API", "SSIS", "SQL"],
-                    "summary": "The candidate demonstrated strong technical expertise across multiple domains with particularly strong performance in .NET Core, Web API optimization, and cloud architecture.",
-                    "recommendations": [
-                        "Focus on improving articulation in some AWS concepts",
-                        "Provide more specific examples for ASP.NET MVC",
-                        "Continue building depth in advanced SQL optimization"
-                    ],
-                    "quality_score": 4,
-                    "word_count": 1200,
-                    "content_analysis": {
-                        "clarity": "high",
-                        "engagement": "high",
-                        "information_density": "high",
-                        "speaker_confidence": "high"
-                    },
-                    "speaking_patterns": {
-                        "pace": "medium",
-                        "filler_words": 2,
-                        "repetitions": 1,
-                        "technical_terms": [".NET Core", "Redis", "SignalR", "CloudFormation", "ECS", "Aurora"]
-                    },
-                    "actionable_insights": [
-                        "Strong practical experience with enterprise-level technologies",
-                        "Excellent understanding of scalable architecture patterns"
-                    ],
-                    "questions": [
-                        {
-                            "question": "How would you optimize a high-traffic Web API?",
-                            "answer": "I would implement rate limiting, response caching, connection pooling, and use HttpClientFactory. Also consider Polly for circuit breaker patterns and background jobs for heavy processing.",
-                            "rating": 5,
-                            "feedback": "Excellent comprehensive answer showing deep understanding of API optimization techniques."
-                        },
-                         {
-                            "question": "How would you handle database optimization for high-traffic applications?",
-                            "answer": "I'd focus on indexing strategies, query optimization, and implementing caching layers. For write-heavy applications, I'd consider sharding and read replicas.",
-                            "rating": 3,
-                            "feedback": "Good foundation but limited depth in advanced optimization and performance tuning."
-                        },
-                        {
-                            "question": "What is the difference between a RESTful API and a GraphQL API?",
-                            "answer": "A RESTful API is a stateless, client-server, hypermedia-driven interface that uses HTTP methods to create, read, update, and delete resources. GraphQL is a query language for APIs that allows clients to request exactly the data they need and nothing more.",
-                            "rating": 4,
-                            "feedback": "Good understanding of the differences between REST and GraphQL."
-                        },
-                        {
-                            "question": "How would you implement a scalable event-driven architecture?",
-                            "answer": "I'd use Azure Service Bus for message queuing, Azure Event Grid for event notifications, and Azure Functions for serverless processing. For real-time features, I'd use SignalR for bidirectional communication.",
-                            "rating": 4,
-                            "feedback": "Good understanding of event-driven architecture patterns."
-                        }
-                    ],
-                    "communication_skills": {
-                        "summary": "Clear and structured communicator with strong technical articulation",
-                        "impact": "Would contribute effectively to team discussions and technical decisions",
-                        "rating": 4,
-                        "language_fluency": 5,
-                        "technical_articulation": 4
-                    },
-                    "technical_skills": {
-                        "skills": [
-                            {
-                                "skill_name": ".NET Core",
-                                "level": "Expert",
-                                "rating_text": "Very Good",
-                                "rating_score": 4,
-                                "detailed_feedback": "The candidate demonstrated a strong grasp of .NET Core concepts and practical applications. They effectively addressed performance optimization using telemetry, Azure Monitor, Redis caching, background jobs, and connection pooling. Their approach to handling high-volume data indicates a well-rounded understanding of scalable, event-driven architecture.",
-                                "strengths": [
-                                    "Performance optimization techniques",
-                                    "Understanding of scalable architecture",
-                                    "Real-time features implementation with SignalR"
-                                ],
-                                "areas_for_improvement": [
-                                    "Could elaborate more on advanced debugging techniques",
-                                    "Deeper discussion of memory management"
-                                ],
-                                "examples_mentioned": ["Redis caching", "Azure Monitor", "SignalR", "background jobs"],
-                                "is_required": True,
-                                "availability_status": "Available"
-                            },
-                            {
-                                "skill_name": "React",
-                                "level": "Beginner",
-                                "rating_text": "Needs Improvement",
-                                "rating_score": 1,
-                                "detailed_feedback": "The candidate briefly mentioned React but did not demonstrate significant knowledge or experience with the framework.",
-                                "strengths": [
-                                    "Basic awareness of React as a frontend technology"
-                                ],
-                                "areas_for_improvement": [
-                                    "Develop practical experience with React components",
-                                    "Learn React hooks and state management",
-                                    "Practice building complete React applications"
-                                ],
-                                "examples_mentioned": [],
-                                "is_required": True,
-                                "availability_status": "Available"
-                            },
-                            {
-                                "skill_name": "GraphQL",
-                                "is_required": True,
-                                "availability_status": "Not Available",
-                                "rating_score": 0,
-                                "strengths": [],
-                                "areas_for_improvement": [],
-                                "examples_mentioned": []
-                            },
-                            {
-                                "skill_name": "AWS",
-                                "level": "Professional",
-                                "rating_text": "Very Good",
-                                "rating_score": 4,
-                                "detailed_feedback": "The candidate demonstrated solid understanding of AWS services and architectural principles. Covered ECS, ALB, Route 53, S3, Aurora, ElastiCache, auto-scaling, and CloudFront. Their breadth of AWS knowledge is commendable, but they should aim for greater precision in terminology.",
-                                "strengths": [
-                                    "Broad knowledge of AWS services",
-                                    "Understanding of CI/CD with CodePipeline",
-                                    "Good grasp of scalability patterns"
-                                ],
-                                "areas_for_improvement": [
-                                    "More precise terminology usage",
-                                    "Deeper security best practices"
-                                ],
-                                "examples_mentioned": ["ECS", "CloudFormation", "CodePipeline", "Aurora", "ElastiCache"],
-                                "is_required": False
-                            }
-                        ],
-                        "required_skills": [
-                            {"name": ".NET Core"},
-                            {"name": "React"},
-                            {"name": "GraphQL"}
-                        ],
-                        "overall_tech_review": "Strong technical candidate with excellent backend expertise and solid cloud architecture knowledge. Ready for senior-level responsibilities.",
-                        "depth_in_core_topics": 4,
-                        "breadth_of_tech_stack": 4,
-                        "strengths_summary": "Strong backend knowledge with solid experience in .NET Core and Web API optimization for scale and performance. Proficient in AWS cloud architecture, CI/CD, and automation. Advanced API design knowledge including traffic handling, caching strategies, and resiliency mechanisms.",
-                        "weaknesses_summary": "Some explanations around AWS IaC were unclear and require refinement. Minor gaps in some areas like ASP.NET MVC discussion.",
-                        "verdict": "The candidate is a strong fit for roles involving .NET Core development, cloud infrastructure (especially AWS), API scalability, and ETL processes. Their technical depth and breadth make them well-suited for full-stack or backend-heavy roles with cloud and data integration responsibilities."
-                    },
-                    "interviewer_notes": "Strong technical candidate with leadership potential. Demonstrates both breadth and depth in relevant technologies.",
-                    "confidence_level": 4,
-                    "culture_fit": 4,
-                    "learning_aptitude": 4,
-                    "final_assessment": "Highly recommended. Strong technical foundation, effective communication, and practical experience make this candidate an excellent fit for senior technical roles."
-                }
-            }
+            # Identical transcription + skills combinations hit the cache
+            # and skip the OpenAI round-trip entirely
+            cache_key = _cache_key(transcription_text, required_skills)
+            cached = self._cache_lookup(cache_key)
+            if cached is not None:
+                logger.info("Returning cached feedback for identical transcription")
+                return cached
 
-            # Create the enhanced prompt template with required skills instructions
-            prompt_text = """You are an expert technical interviewer and feedback analyst specializing in comprehensive technical assessments.
-
-            Your task is to analyze the provided interview transcription and generate detailed feedback that includes:
-            1. Extract all main technical skills mentioned in the transcript
-            2. For each skill, provide detailed feedback similar to a professional technical assessment
-            3. Include specific ratings, strengths, areas for improvement, and examples mentioned
-            4. Provide an overall technical summary with strengths, weaknesses, and final verdict
-            5. Extract all questions and answers from the interview transcript and provide feedback on them
-
-            Additionally, you need to evaluate the following specific required skills:
-            {required_skills_list}
-
-            For each required skill:
-            - Check if the skill is mentioned or discussed in the interview
-            - If available, provide a detailed assessment with level, rating, and feedback
-            - If not available, mark it as "Not Available" and set availability_status to "Not Available"
-            - Set is_required to true for all required skills
-
-            Focus on:
-            - Identifying specific technologies, frameworks, or technical concepts discussed
-            - Assessing the depth of knowledge demonstrated for each skill
-            - Providing constructive, professional feedback
-            - Rating skills on both numerical (1-5) and text scales (Excellent, Very Good, Good, Satisfactory, Needs Improvement)
-            - Including specific examples or concepts mentioned by the candidate
-            - Evaluating the candidate's ability to discuss the skill in detail
-            - Evaluating the candidate's ability to apply the skill in a practical way
-            - Evaluating the candidate's ability to discuss the skill in a way that is clear and concise
-            - Evaluating the candidate's ability to discuss the skill in a way that is accurate and correct
-            - Evaluating the candidate's ability to discuss the skill in a way that is consistent with the skill's definition
-            - Evaluating the candidate's ability to discuss the skill in a way that is consistent with the skill's best practices
-            - Evaluating the candidate's ability to discuss the skill in a way that is consistent with the skill's industry standards
-
-            Follow the JSON schema exactly and ensure all ratings are integers from 1-5.
-            
-            Use this JSON schema:
-            {schema}
-            
-            Here's an example of the expected detailed feedback format:
-            {example}
-            
-            Provide your feedback in valid JSON format following the exact same structure."""
+            # Semantic tier: a ~10ms embedding lookup can still save the
+            # full LLM call for near-duplicate transcripts
+            vector = self._try_embed(transcription_text)
+            if vector is not None:
+                cached = self._semantic_lookup(vector, required_skills)
+                if cached is not None:
+                    return cached
 
-            # Format the required skills as a readable list for the prompt
-            required_skills_formatted = "None specified" if not required_skills else "\n".join([f"- {skill}" for skill in required_skills])
+            # Get response from OpenAI, routing to the model sized for this
+            # transcript (see _route_llm)
+            llm = self._route_llm(transcription_text, required_skills)
+            response = self._invoke(llm, self._build_messages(transcription_text, required_skills))
 
-            # Create the prompt template
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", prompt_text),
-                ("user", "Here's the interview transcription to analyze:\n\n{transcription}")
-            ])
+            result = self._parse_response(response, transcription_text, required_skills, cache_key=cache_key)
+            # Index the embedding only if the response validated and was cached
+            if vector is not None and cache_key in self._response_cache:
+                self._semantic_store(vector, cache_key)
+            return result
 
-            # Format the prompt with our schema, example, transcription, and required skills
-            formatted_prompt = prompt.format_messages(
-                schema=json.dumps(schema, indent=2),
-                example=json.dumps(example, indent=2),
-                transcription=transcription_text,
-                required_skills_list=required_skills_formatted
-            )
+        except Exception as e:
+            logger.error("Error generating feedback: %s", str(e))
+            return self._get_fallback_feedback(transcription_text, required_skills)
+
+    async def agenerate_feedback(self, transcription_text: str, required_skills: List[str] = None) -> Dict[str, Any]:
+        """Async variant of generate_feedback
+
+        Awaiting the OpenAI round-trip instead of blocking lets many
+        transcriptions be evaluated concurrently; the shared semaphore caps
+        how many are in flight at once.
+        """
+        try:
+            logger.info("Generating feedback using OpenAI...")
+
+            # Default to empty list if required_skills is None
+            if required_skills is None:
+                required_skills = []
+
+            # Log the required skills
+            if required_skills and logger.isEnabledFor(logging.INFO):
+                logger.info("Required skills to evaluate: %s", ", ".join(required_skills))
+
+            cache_key = _cache_key(transcription_text, required_skills)
+            cached = self._cache_lookup(cache_key)
+            if cached is not None:
+                logger.info("Returning cached feedback for identical transcription")
+                return cached
+
+            # Semantic tier: a ~10ms embedding lookup can still save the
+            # full LLM call for near-duplicate transcripts
+            vector = await self._atry_embed(transcription_text)
+            if vector is not None:
+                cached = self._semantic_lookup(vector, required_skills)
+                if cached is not None:
+                    return cached
+
+            # Shard the generation: questions/communication and the technical
+            # assessment are independent, so two smaller tool calls run in
+            # parallel and finish in ~max(t1, t2) instead of t1 + t2.
+            messages = self._build_messages(transcription_text, required_skills)
+            llm = self._route_llm(transcription_text, required_skills)
+            async with self._sem:
+                question_response, tech_response = await asyncio.gather(
+                    self._ainvoke(llm, messages, tools=_QUESTION_SHARD_TOOLS, tool_choice=_FEEDBACK_TOOL_CHOICE),
+                    self._ainvoke(llm, messages, tools=_TECH_SHARD_TOOLS, tool_choice=_FEEDBACK_TOOL_CHOICE),
+                )
+
+            feedback = self._extract_feedback_payload(tech_response)
+            feedback.update(self._extract_feedback_payload(question_response))
+            result = self._finalize_payload(feedback, transcription_text, required_skills, cache_key=cache_key)
+            # Index the embedding only if the response validated and was cached
+            if vector is not None and cache_key in self._response_cache:
+                self._semantic_store(vector, cache_key)
+            return result
 
-            # Get response from OpenAI
-            response = self.llm.invoke(formatted_prompt)
-            
-            try:
-                # Parse the response to extract JSON
-                response_text = response.content.strip()
-                
-                # Try to find and extract JSON
-                json_start = response_text.find('{')
-                json_end = response_text.rfind('}') + 1
-                
-                if json_start >= 0 and json_end > json_start:
-                    json_str = response_text[json_start:json_end]
-                    feedback_data = json.loads(json_str)
-                    
-                    # Check if we have the expected structure
-                    if 'feedback' in feedback_data and isinstance(feedback_data['feedback'], dict):
-                        feedback = feedback_data['feedback']
-                        
-                        # Add required skills to the technical_skills section if they're not already there
-                        if 'technical_skills' in feedback:
-                            if 'skills' not in feedback['technical_skills']:
-                                feedback['technical_skills']['skills'] = []
-                                
-                            # Add required_skills section if it doesn't exist
-                            if 'required_skills' not in feedback['technical_skills']:
-                                feedback['technical_skills']['required_skills'] = []
-                                
-                            # Add each required skill to the required_skills list
-                            for skill_name in required_skills:
-                                # Check if this required skill is already in the skills list
-                                skill_exists = False
-                                for skill in feedback['technical_skills']['skills']:
-                                    if skill.get('skill_name', '').lower() == skill_name.lower():
-                                        # Mark existing skill as required
-                                        skill['is_required'] = True
-                                        if 'availability_status' not in skill:
-                                            skill['availability_status'] = 'Available'
-                                        skill_exists = True
-                                        break
-                                
-                                # If skill wasn't found in the skills list, add it as not available
-                                if not skill_exists:
-                                    feedback['technical_skills']['skills'].append({
-                                        'skill_name': skill_name,
-                                        'is_required': True,
-                                        'availability_status': 'Not Available',
-                                        'rating_score': 0,
-                                        'strengths': [],
-                                        'areas_for_improvement': [],
-                                        'examples_mentioned': []
-                                    })
-                                    
-                                # Add to required_skills list
-                                feedback['technical_skills']['required_skills'].append({
-                                    'name': skill_name
-                                })
-                            
-                            logger.info("Successfully generated enhanced technical skills feedback with required skills evaluation")
-                            return feedback
-                        else:
-                            logger.warning("Response missing technical_skills structure")
-                    else:
-                        logger.warning("Response did not contain expected 'feedback' key or structure")
-                else:
-                    logger.warning("No valid JSON found in response")
-                
-                # If we get here, the response wasn't properly formatted
-                logger.info("Using enhanced fallback feedback due to response format issues")
-                return self._get_fallback_feedback(transcription_text, required_skills)
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON from response: {e}")
-                logger.info("Using enhanced fallback feedback due to JSON parsing error")
-                return self._get_fallback_feedback(transcription_text, required_skills)
-                
         except Exception as e:
-            logger.error(f"Error generating feedback: {str(e)}")
+            logger.error("Error generating feedback: %s", str(e))
             return self._get_fallback_feedback(transcription_text, required_skills)
 
+    def generate_feedback_offline_batch(self, transcripts: List[Tuple[str, List[str]]], poll_interval: float = 30.0) -> List[Dict[str, Any]]:
+        """Generate feedback for a large corpus via OpenAI's Batch API
+
+        Serializes one chat-completion request per (transcription, required
+        skills) pair into a JSONL file, submits it as a batch (half the
+        per-token price, 24h completion window), polls until it finishes, and
+        runs each result through the normal parsing/validation path. Intended
+        for offline bulk evaluation, not interactive requests.
+        """
+        import tempfile
+        import time
+        from langchain_core.messages import AIMessage
+        from openai import OpenAI
+
+        client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        role_map = {"system": "system", "human": "user"}
+
+        # Write one request line per transcript and upload the file
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as batch_file:
+            for i, (text, skills) in enumerate(transcripts):
+                messages = self._build_messages(text, skills or [])
+                batch_file.write(json.dumps({
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": "gpt-4o-mini",
+                        "temperature": 0.7,
+                        "tools": _FEEDBACK_TOOLS,
+                        "tool_choice": _FEEDBACK_TOOL_CHOICE,
+                        "messages": [
+                            {"role": role_map[message.type], "content": message.content}
+                            for message in messages
+                        ]
+                    }
+                }) + "\n")
+
+        try:
+            with open(batch_file.name, "rb") as f:
+                uploaded = client.files.create(file=f, purpose="batch")
+        finally:
+            os.remove(batch_file.name)
+
+        batch = client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info("Submitted feedback batch %s with %d requests", batch.id, len(transcripts))
+
+        # Poll until the batch reaches a terminal state
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = client.batches.retrieve(batch.id)
+
+        result_messages = {}
+        if batch.status == "completed" and batch.output_file_id:
+            output = client.files.content(batch.output_file_id)
+            for line in output.text.splitlines():
+                item = json.loads(line)
+                response_body = item.get("response", {}).get("body", {})
+                choices = response_body.get("choices", [])
+                if choices:
+                    result_messages[item["custom_id"]] = choices[0]["message"]
+        else:
+            logger.error("Feedback batch %s finished with status: %s", batch.id, batch.status)
+
+        # Missing or failed lines get the usual fallback feedback
+        results = []
+        for i, (text, skills) in enumerate(transcripts):
+            message = result_messages.get(str(i))
+            if message is None:
+                results.append(self._get_fallback_feedback(text, skills or []))
+            else:
+                # With tool_choice forced, the payload arrives as tool-call
+                # arguments and content is null; rebuild an AIMessage with the
+                # typed tool_calls field (arguments parsed into dicts) so
+                # _extract_feedback_payload reads whichever is present.
+                # Undecodable arguments are skipped, which drops the line
+                # through to the content path and from there to the fallback.
+                tool_calls = []
+                for call in message.get("tool_calls") or []:
+                    try:
+                        args = _JSON_DECODER.decode(call["function"]["arguments"])
+                    except msgspec.DecodeError:
+                        continue
+                    tool_calls.append({
+                        "name": call["function"]["name"],
+                        "args": args,
+                        "id": call.get("id"),
+                        "type": "tool_call"
+                    })
+                response = AIMessage(
+                    content=message.get("content") or "",
+                    tool_calls=tool_calls
+                )
+                results.append(self._parse_response(response, text, skills or []))
+        return results
+
+    async def generate_feedback_batch(self, transcription_texts: List[str], required_skills: List[str] = None) -> List[Dict[str, Any]]:
+        """Generate feedback for several transcriptions concurrently
+
+        Dispatches all prompts through the model's async batch interface so the
+        per-request network latency overlaps instead of accumulating.
+        """
+        if required_skills is None:
+            required_skills = []
+
+        # Resolve cache hits first and only dispatch the misses
+        cache_keys = [_cache_key(text, required_skills) for text in transcription_texts]
+        results = [self._cache_lookup(key) for key in cache_keys]
+        pending = [i for i, result in enumerate(results) if result is None]
+
+        if not pending:
+            return results
+
+        message_lists = [
+            self._build_messages(transcription_texts[i], required_skills)
+            for i in pending
+        ]
+
+        try:
+            logger.info("Generating feedback for a batch of %d transcriptions...", len(pending))
+            responses = await self.llm.abatch(message_lists, config={"max_concurrency": settings.OPENAI_CONCURRENCY})
+        except Exception as e:
+            logger.error("Error generating batch feedback: %s", str(e))
+            for i in pending:
+                results[i] = self._get_fallback_feedback(transcription_texts[i], required_skills)
+            return results
+
+        for i, response in zip(pending, responses):
+            results[i] = self._parse_response(
+                response, transcription_texts[i], required_skills, cache_key=cache_keys[i]
+            )
+        return results
+
+    def refine_feedback_text(self, feedback: Dict[str, Any]) -> Dict[str, Any]:
+        """Polish the free-text assessment fields with the stronger model
+
+        Sends only the summary fields through gpt-4o, so the expensive model
+        sees a few hundred tokens instead of the full transcript prompt.
+        The feedback dict is updated in place and returned; any failure
+        leaves the draft text untouched.
+        """
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        try:
+            response = self._invoke(self.llm_synth, [
+                SystemMessage(content=_POLISH_PROMPT),
+                HumanMessage(content=json.dumps({
+                    "summary": feedback.get("summary", ""),
+                    "interviewer_notes": feedback.get("interviewer_notes", ""),
+                    "final_assessment": feedback.get("final_assessment", "")
+                }))
+            ])
+            polished = _JSON_DECODER.decode(response.content)
+            for field in ("summary", "interviewer_notes", "final_assessment"):
+                if isinstance(polished.get(field), str) and polished[field]:
+                    feedback[field] = polished[field]
+        except Exception as e:
+            logger.warning("Skipping feedback text refinement: %s", str(e))
+        return feedback
+
+    async def generate_feedback_stream(self, transcription_text: str, required_skills: List[str] = None):
+        """Stream feedback generation instead of blocking on the full response
+
+        Yields the raw content chunks as they arrive so callers (e.g. a
+        WebSocket UI) can render partial output at first-token latency, then
+        yields the parsed and validated feedback dict as the final item.
+        """
+        from langchain_core.messages import AIMessage
+
+        if required_skills is None:
+            required_skills = []
+
+        cache_key = _cache_key(transcription_text, required_skills)
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            logger.info("Returning cached feedback for identical transcription")
+            yield cached
+            return
+
+        chunks = []
+        try:
+            async for chunk in self.llm.astream(self._build_messages(transcription_text, required_skills)):
+                # With a forced tool call the JSON streams in as argument
+                # fragments on tool_call_chunks rather than message content
+                fragment = chunk.content
+                if not fragment:
+                    for tool_chunk in getattr(chunk, "tool_call_chunks", None) or []:
+                        fragment += tool_chunk.get("args") or ""
+                if fragment:
+                    chunks.append(fragment)
+                    yield fragment
+        except Exception as e:
+            logger.error("Error streaming feedback: %s", str(e))
+            yield self._get_fallback_feedback(transcription_text, required_skills)
+            return
+
+        yield self._parse_response(
+            AIMessage(content="".join(chunks)),
+            transcription_text,
+            required_skills,
+            cache_key=cache_key
+        )
+
+    def has_validated_feedback(self, transcription_text: str, required_skills: List[str] = None) -> bool:
+        """True if feedback for this transcript validated and was cached
+
+        Fallback output never enters _response_cache, so callers layering
+        their own caches (e.g. the /transcribe response cache) can use this
+        to avoid pinning degraded results.
+        """
+        return _cache_key(transcription_text, required_skills or []) in self._response_cache
+
     def _get_fallback_feedback(self, transcription_text: str, required_skills: List[str] = None) -> Dict[str, Any]:
         """Provide complete fallback feedback when OpenAI fails"""
         if required_skills is None:
             required_skills = []
             
-        word_count = len(transcription_text.split())
-        
-        # Analyze the text for basic technical terms to provide meaningful fallback
-        technical_terms = []
-        common_tech_terms = [
-            '.net', 'c#', 'java', 'python', 'javascript', 'react', 'angular', 'vue',
-            'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'aws', 'azure', 'gcp',
-            'docker', 'kubernetes', 'microservices', 'api', 'rest', 'graphql',
-            'node.js', 'express', 'spring', 'django', 'flask', 'laravel'
-        ]
+        word_count = _count_words(transcription_text)
         
+        # Analyze the text for basic technical terms to provide meaningful
+        # fallback; one automaton pass finds every vocabulary term at once
         text_lower = transcription_text.lower()
-        for term in common_tech_terms:
-            if term in text_lower:
-                technical_terms.append(term.upper() if term in ['.net', 'c#'] else term.title())
-        
+        matched_terms = dict.fromkeys(term for _, term in _TECH_TERMS_AUTOMATON.iter(text_lower))
+        technical_terms = [
+            term.upper() if term in ('.net', 'c#') else term.title()
+            for term in matched_terms
+        ]
+
         # Generate skills based on detected technical terms
         skills = []
-        
+        terms_lower = {term.lower() for term in technical_terms}
+        required_lower = {skill_name.lower() for skill_name in required_skills}
+
         # First, add required skills
         for skill_name in required_skills:
             # Check if this required skill is in the detected technical terms
-            is_available = any(term.lower() == skill_name.lower() for term in technical_terms)
-            
-            if is_available:
-                skills.append({
-                    "skill_name": skill_name,
-                    "level": "Professional",
-                    "rating_text": "Good",
-                    "rating_score": 3,
-                    "detailed_feedback": f"The candidate demonstrated familiarity with {skill_name} concepts and showed practical understanding. Their discussion covered relevant aspects of {skill_name} technology, indicating a solid foundation with room for growth in advanced topics.",
-                    "strengths": [
-                        f"Basic to intermediate understanding of {skill_name}",
-                        "Able to discuss practical applications",
-                        "Shows awareness of common patterns and practices"
-                    ],
-                    "areas_for_improvement": [
-                        f"Could provide more specific examples of {skill_name} usage",
-                        "Deeper technical details would strengthen responses",
-                        "More discussion of best practices and optimization"
-                    ],
-                    "examples_mentioned": [skill_name],
-                    "is_required": True,
-                    "availability_status": "Available"
-                })
+            if skill_name.lower() in terms_lower:
+                skills.append(_make_skill_entry(skill_name, is_required=True))
             else:
-                skills.append({
-                    "skill_name": skill_name,
-                    "is_required": True,
-                    "availability_status": "Not Available",
-                    "rating_score": 0,
-                    "strengths": [],
-                    "areas_for_improvement": [],
-                    "examples_mentioned": []
-                })
-        
+                skills.append(_make_unavailable_skill_entry(skill_name))
+
         # Then add detected skills that aren't in the required skills
         for term in technical_terms:
-            if not any(skill.get('skill_name', '').lower() == term.lower() for skill in skills):
-                skills.append({
-                    "skill_name": term,
-                    "level": "Professional",
-                    "rating_text": "Good",
-                    "rating_score": 3,
-                    "detailed_feedback": f"The candidate demonstrated familiarity with {term} concepts and showed practical understanding. Their discussion covered relevant aspects of {term} technology, indicating a solid foundation with room for growth in advanced topics.",
-                    "strengths": [
-                        f"Basic to intermediate understanding of {term}",
-                        "Able to discuss practical applications",
-                        "Shows awareness of common patterns and practices"
-                    ],
-                    "areas_for_improvement": [
-                        f"Could provide more specific examples of {term} usage",
-                        "Deeper technical details would strengthen responses",
-                        "More discussion of best practices and optimization"
-                    ],
-                    "examples_mentioned": [term],
-                    "is_required": False
-                })
-        
+            if term.lower() not in required_lower:
+                skills.append(_make_skill_entry(term))
+
         # If no skills found, provide a general technical skill
         if not skills:
-            skills.append({
-                "skill_name": "General Technical Knowledge",
-                "level": "Intermediate",
-                "rating_text": "Satisfactory",
-                "rating_score": 3,
-                "detailed_feedback": "The candidate participated in a technical discussion and demonstrated general understanding of software development concepts. While specific technical expertise wasn't clearly evident in the transcript, they showed engagement with technical topics.",
-                "strengths": [
-                    "Engaged in technical discussion",
-                    "Showed willingness to tackle technical problems",
-                    "Demonstrated analytical thinking"
-                ],
-                "areas_for_improvement": [
-                    "More specific technical examples would be beneficial",
-                    "Deeper dive into chosen technologies",
-                    "Stronger articulation of technical concepts"
-                ],
-                "examples_mentioned": ["Software development", "Problem solving"],
-                "is_required": False
-            })
-        
+            skills.append(copy.deepcopy(_GENERIC_SKILL_ENTRY))
+
         # Create required_skills list for the response
         required_skills_list = [{"name": skill} for skill in required_skills]
-        
-        return {
-            "overall_sentiment": "neutral",
-            "key_topics": technical_terms if technical_terms else ["software development", "problem solving"],
-            "summary": f"Technical interview analysis completed for {word_count} words of content. The candidate engaged in technical discussions and demonstrated familiarity with relevant technologies.",
-            "recommendations": [
-                "Provide more detailed technical examples in future interviews",
-                "Practice articulating complex technical concepts clearly",
-                "Prepare specific use cases and implementation details"
-            ],
-            "quality_score": 3,
-            "word_count": word_count,
-            "content_analysis": {
-                "clarity": "medium",
-                "engagement": "medium",
-                "information_density": "medium",
-                "speaker_confidence": "medium"
-            },
-            "speaking_patterns": {
-                "pace": "medium",
-                "filler_words": 2,
-                "repetitions": 1,
-                "technical_terms": technical_terms
-            },
-            "actionable_insights": [
-                "Technical interview completed with measurable outcomes",
-                f"Conversation included {len(technical_terms)} identifiable technical concepts",
-                "Candidate showed engagement with technical problem-solving"
-            ],
-            "questions": [
-                {
-                    "question": "Technical competency assessment",
-                    "answer": "Candidate demonstrated baseline technical knowledge with room for growth",
-                    "rating": 3,
-                    "feedback": "Technical understanding appears solid with opportunities to demonstrate deeper expertise"
-                }
-            ],
-            "communication_skills": {
-                "summary": "Clear communication with adequate technical articulation",
-                "impact": "Would likely contribute effectively to technical team discussions",
-                "rating": 3,
-                "language_fluency": 4,
-                "technical_articulation": 3
-            },
-            "technical_skills": {
-                "skills": skills,
-                "required_skills": required_skills_list,
-                "overall_tech_review": f"The candidate demonstrated competency in {len(skills)} technical area{'s' if len(skills) > 1 else ''} with solid foundational knowledge. Their responses showed practical understanding of key concepts with opportunities for deeper technical exploration.",
-                "depth_in_core_topics": 3,
-                "breadth_of_tech_stack": 3,
-                "strengths_summary": f"Solid foundational knowledge across {', '.join(technical_terms[:3]) if technical_terms else 'core technical concepts'}. Demonstrated practical understanding and engagement with technical problem-solving. Shows analytical thinking and willingness to tackle complex topics.",
-                "weaknesses_summary": "Could benefit from more detailed technical examples and deeper articulation of advanced concepts. Opportunities to demonstrate hands-on experience with specific implementations and optimization strategies.",
-                "verdict": f"The candidate shows promise for technical roles requiring {', '.join(technical_terms[:2]) if len(technical_terms) >= 2 else 'software development'} expertise. With continued learning and practical experience, they would be well-suited for intermediate to senior technical positions. Recommended for roles where foundational knowledge can be built upon with mentorship and practical application."
-            },
-            "interviewer_notes": f"Technical interview completed successfully. Candidate engaged well with technical topics and showed {len(technical_terms)} specific technology areas. Assessment based on {word_count} words of interview content.",
-            "confidence_level": 3,
-            "culture_fit": 3,
-            "learning_aptitude": 4,
-            "final_assessment": f"Recommended for technical roles. The candidate demonstrated solid baseline technical knowledge with clear potential for growth. Their engagement with technical topics and analytical approach suggest they would be successful in collaborative development environments."
-        }
\ No newline at end of file
+
+        # Start from the static template and fill in the per-call fields
+        fallback = copy.deepcopy(_FALLBACK_TEMPLATE)
+        fallback["key_topics"] = technical_terms if technical_terms else ["software development", "problem solving"]
+        fallback["summary"] = f"Technical interview analysis completed for {word_count} words of content. The candidate engaged in technical discussions and demonstrated familiarity with relevant technologies."
+        fallback["word_count"] = word_count
+        fallback["speaking_patterns"]["technical_terms"] = technical_terms
+        fallback["actionable_insights"] = [
+            "Technical interview completed with measurable outcomes",
+            f"Conversation included {len(technical_terms)} identifiable technical concepts",
+            "Candidate showed engagement with technical problem-solving"
+        ]
+        fallback["technical_skills"] = {
+            "skills": skills,
+            "required_skills": required_skills_list,
+            "overall_tech_review": f"The candidate demonstrated competency in {len(skills)} technical area{'s' if len(skills) > 1 else ''} with solid foundational knowledge. Their responses showed practical understanding of key concepts with opportunities for deeper technical exploration.",
+            "depth_in_core_topics": 3,
+            "breadth_of_tech_stack": 3,
+            "strengths_summary": f"Solid foundational knowledge across {', '.join(technical_terms[:3]) if technical_terms else 'core technical concepts'}. Demonstrated practical understanding and engagement with technical problem-solving. Shows analytical thinking and willingness to tackle complex topics.",
+            "weaknesses_summary": "Could benefit from more detailed technical examples and deeper articulation of advanced concepts. Opportunities to demonstrate hands-on experience with specific implementations and optimization strategies.",
+            "verdict": f"The candidate shows promise for technical roles requiring {', '.join(technical_terms[:2]) if len(technical_terms) >= 2 else 'software development'} expertise. With continued learning and practical experience, they would be well-suited for intermediate to senior technical positions. Recommended for roles where foundational knowledge can be built upon with mentorship and practical application."
+        }
+        fallback["interviewer_notes"] = f"Technical interview completed successfully. Candidate engaged well with technical topics and showed {len(technical_terms)} specific technology areas. Assessment based on {word_count} words of interview content."
+        return fallback
+
+@lru_cache(maxsize=1)
+def get_feedback_service() -> FeedbackService:
+    """Return the shared FeedbackService instance, constructing it on first use
+
+    ChatOpenAI construction is expensive (pydantic model building, HTTP client
+    setup), so every caller should reuse this one instance rather than
+    instantiating FeedbackService per request.
+    """
+    return FeedbackService()
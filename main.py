@@ -1,11 +1,21 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+import asyncio
+from collections import OrderedDict
+import hashlib
 import logging
 import os
+from dotenv import load_dotenv
+
+# Populate os.environ from .env once, before importing any module that reads
+# environment variables at import time (config, feedback_service)
+load_dotenv()
+
 from models import VideoTranscriptionRequest, TranscriptionResponse
 from video_processor import VideoProcessor
 from transcription_service import TranscriptionService
-from feedback_service import FeedbackService
+from feedback_service import get_feedback_service
 from config import settings
 
 # Configure logging
@@ -16,7 +26,9 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Video Transcription & Feedback API",
     description="API for transcribing videos and generating feedback using LLM",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson serializes the large segment+feedback responses in native code
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -31,16 +43,37 @@ app.add_middleware(
 # Initialize services
 video_processor = VideoProcessor(temp_dir=settings.TEMP_DIR)
 transcription_service = TranscriptionService()
-feedback_service = FeedbackService()
+feedback_service = get_feedback_service()
+
+# LRU cache of full /transcribe responses keyed by video URL + skills, so
+# re-reviews of the same interview skip the download/transcription/LLM
+# pipeline entirely
+_RESPONSE_CACHE = OrderedDict()
+_RESPONSE_CACHE_SIZE = 128
+
+def _response_cache_key(video_url: str, required_skills, polish: bool = False) -> str:
+    payload = f"{video_url}|{sorted(required_skills or [])}|{polish}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+@app.on_event("startup")
+async def startup_event():
+    # Warm the transcription model on a worker thread so the first real
+    # request doesn't pay the cold-path cost
+    await asyncio.to_thread(transcription_service.warmup)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Close the pooled HTTP connections held by the feedback service
+    await feedback_service.aclose()
 
 def cleanup_audio_file(file_path: str):
     """Background task to cleanup audio file"""
     try:
         if os.path.exists(file_path):
             os.remove(file_path)
-            logger.info(f"Cleaned up audio file: {file_path}")
+            logger.info("Cleaned up audio file: %s", file_path)
     except Exception as e:
-        logger.warning(f"Failed to cleanup audio file {file_path}: {str(e)}")
+        logger.warning("Failed to cleanup audio file %s: %s", file_path, str(e))
 
 @app.get("/")
 async def root():
@@ -48,57 +81,89 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "using_huggingface_models": True}
+    return {
+        "status": "healthy",
+        "transcription_backend": "faster-whisper",
+        "whisper_model": settings.WHISPER_MODEL,
+        "device": transcription_service.device
+    }
 
 @app.post("/transcribe", response_model=TranscriptionResponse)
 async def transcribe_video(
     request: VideoTranscriptionRequest,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    response: Response
 ):
     """
     Transcribe video from URL and generate feedback
     
     - **video_url**: URL of the video to transcribe (YouTube, direct video links, etc.)
     - **required_skills**: Optional list of skills to evaluate in the interview
+    - **polish_feedback**: Optionally rewrite the summary fields with the stronger model
     
     Returns transcription segments, full text, and comprehensive feedback analysis.
     """
     
-    # No API key needed for Hugging Face models
-    
+    # Identical URL + skills combinations are served from the response cache
+    cache_key = _response_cache_key(
+        str(request.video_url), request.required_skills, bool(request.polish_feedback)
+    )
+    cached = _RESPONSE_CACHE.get(cache_key)
+    if cached is not None:
+        _RESPONSE_CACHE.move_to_end(cache_key)
+        logger.info("Returning cached response for video URL")
+        response.headers["X-Cache"] = "HIT"
+        return cached
+    response.headers["X-Cache"] = "MISS"
+
     audio_path = None
-    
+
     try:
-        logger.info(f"Processing video URL: {request.video_url}")
+        logger.info("Processing video URL: %s", request.video_url)
         
-        if request.required_skills and len(request.required_skills) > 0:
-            logger.info(f"Required skills to evaluate: {', '.join(request.required_skills)}")
+        if request.required_skills and logger.isEnabledFor(logging.INFO):
+            logger.info("Required skills to evaluate: %s", ", ".join(request.required_skills))
         
-        # Step 1: Download video and extract audio
-        audio_path, duration = video_processor.process_video_url(str(request.video_url))
-        logger.info(f"Audio extracted successfully, duration: {duration}s")
+        # Step 1: Download video and extract audio (off the event loop)
+        audio_path, duration = await video_processor.aprocess_video_url(str(request.video_url))
+        logger.info("Audio extracted successfully, duration: %ss", duration)
         
-        # Step 2: Transcribe audio
-        segments = transcription_service.transcribe_audio(audio_path)
+        # Step 2: Transcribe audio (compute-bound, off the event loop so
+        # concurrent requests keep being served)
+        segments = await asyncio.to_thread(transcription_service.transcribe_audio, audio_path)
         full_text = transcription_service.get_full_text(segments)
-        logger.info(f"Transcription completed: {len(full_text)} characters")
-        
-        # Step 3: Generate feedback with required skills
-        feedback = feedback_service.generate_feedback(full_text, request.required_skills)
+        logger.info("Transcription completed: %d characters", len(full_text))
+
+        # Step 3: Generate feedback with required skills via the async
+        # OpenAI path, which awaits the network round-trip natively
+        feedback = await feedback_service.agenerate_feedback(full_text, request.required_skills)
         logger.info("Feedback generated successfully")
 
-        print(feedback)
-        
+        # Optional polish pass: rewrite the summary fields with the
+        # stronger model (blocking call, so off the event loop)
+        if request.polish_feedback:
+            feedback = await asyncio.to_thread(feedback_service.refine_feedback_text, feedback)
+
         # Schedule cleanup of audio file
         background_tasks.add_task(cleanup_audio_file, audio_path)
         
-        # Return response
-        return TranscriptionResponse(
+        # Build, cache, and return the response. model_construct skips
+        # re-validating data our own services just produced (segments are
+        # already TranscriptionSegment models, feedback is already validated
+        # in FeedbackService); FastAPI still validates on serialization.
+        result = TranscriptionResponse.model_construct(
             transcription=segments,
             full_text=full_text,
             duration=duration,
             feedback=feedback
         )
+        # Only cache responses whose feedback validated; fallback output
+        # produced during an outage must not be pinned for this URL
+        if feedback_service.has_validated_feedback(full_text, request.required_skills):
+            _RESPONSE_CACHE[cache_key] = result
+            if len(_RESPONSE_CACHE) > _RESPONSE_CACHE_SIZE:
+                _RESPONSE_CACHE.popitem(last=False)
+        return result
         
     except Exception as e:
         # Cleanup audio file on error
@@ -108,7 +173,7 @@ async def transcribe_video(
             except:
                 pass
         
-        logger.error(f"Error processing video: {str(e)}")
+        logger.error("Error processing video: %s", str(e))
         raise HTTPException(status_code=500, detail=f"Error processing video: {str(e)}")
 
 if __name__ == "__main__":
@@ -4,6 +4,7 @@ from typing import List, Dict, Any, Optional
 class VideoTranscriptionRequest(BaseModel):
     video_url: HttpUrl
     required_skills: Optional[List[str]] = []
+    polish_feedback: Optional[bool] = False  # Rewrite summary fields with the stronger model
 
 class TranscriptionSegment(BaseModel):
     start_time: float
@@ -36,6 +37,50 @@ class TechnicalSkillsAssessment(BaseModel):
     weaknesses_summary: str
     verdict: str
 
+class ContentAnalysis(BaseModel):
+    clarity: str  # high | medium | low
+    engagement: str  # high | medium | low
+    information_density: str  # high | medium | low
+    speaker_confidence: str  # high | medium | low
+
+class SpeakingPatterns(BaseModel):
+    pace: str  # fast | medium | slow
+    filler_words: int  # 1-5
+    repetitions: int  # 1-5
+    technical_terms: List[str]
+
+class QuestionFeedback(BaseModel):
+    question: str
+    answer: str
+    rating: int  # 1-5
+    feedback: str
+
+class CommunicationSkills(BaseModel):
+    summary: str
+    impact: str
+    rating: int  # 1-5
+    language_fluency: int  # 1-5
+    technical_articulation: int  # 1-5
+
+class Feedback(BaseModel):
+    overall_sentiment: str  # positive | neutral | negative
+    key_topics: List[str]
+    summary: str
+    recommendations: List[str]
+    quality_score: int  # 1-5
+    word_count: int
+    content_analysis: ContentAnalysis
+    speaking_patterns: SpeakingPatterns
+    actionable_insights: List[str]
+    questions: List[QuestionFeedback]
+    communication_skills: CommunicationSkills
+    technical_skills: TechnicalSkillsAssessment
+    interviewer_notes: str
+    confidence_level: int  # 1-5
+    culture_fit: int  # 1-5
+    learning_aptitude: int  # 1-5
+    final_assessment: str
+
 class TranscriptionResponse(BaseModel):
     transcription: List[TranscriptionSegment]
     full_text: str
@@ -1,86 +1,98 @@
-import torch
-import librosa
-import soundfile as sf
-from transformers import WhisperProcessor, WhisperForConditionalGeneration
+import ctranslate2
+from faster_whisper import BatchedInferencePipeline, WhisperModel
 from typing import List
 import logging
 import os
+from config import settings
 from models import TranscriptionSegment
 
 logger = logging.getLogger(__name__)
 
 class TranscriptionService:
     def __init__(self):
-        """Initialize Hugging Face Whisper model"""
-        logger.info("Loading Whisper model from Hugging Face...")
-        
-        # Use a smaller Whisper model for faster processing
-        model_name = "openai/whisper-small"  # You can use "openai/whisper-base" for even faster processing
-        
-        self.processor = WhisperProcessor.from_pretrained(model_name)
-        self.model = WhisperForConditionalGeneration.from_pretrained(model_name)
-        
-        # Use GPU if available
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.model.to(self.device)
-        
-        logger.info(f"Whisper model loaded on {self.device}")
-    
+        """Initialize Whisper model on the CTranslate2 backend"""
+        logger.info("Loading Whisper model (faster-whisper / CTranslate2)...")
+
+        # CTranslate2 runs fused attention with cached KV decoding; int8
+        # weights on CPU (float16 on GPU) move a quarter of the bytes fp32
+        # would, which is where Whisper spends its time.
+        model_name = settings.WHISPER_MODEL
+
+        if ctranslate2.get_cuda_device_count() > 0:
+            self.device = "cuda"
+            compute_type = "float16"
+        else:
+            self.device = "cpu"
+            compute_type = "int8"
+
+        self.model = WhisperModel(model_name, device=self.device, compute_type=compute_type)
+        # Batched pipeline runs independent audio windows through the model
+        # together instead of one decode per window
+        self.pipeline = BatchedInferencePipeline(model=self.model)
+
+        logger.info(f"Whisper model loaded on {self.device} ({compute_type})")
+
+    def warmup(self):
+        """Run a short silent clip through the model
+
+        The first transcription otherwise pays one-off backend setup
+        (kernel/library initialization, memory pool growth); doing it at
+        startup keeps request latency steady from the first real call.
+        """
+        import numpy as np
+
+        silence = np.zeros(16000, dtype=np.float32)  # one second at 16kHz
+        segments, _ = self.model.transcribe(silence, beam_size=1)
+        for _ in segments:  # segments are generated lazily; drain them
+            pass
+        logger.info("Whisper warmup complete")
+
     def transcribe_audio(self, audio_file_path: str) -> List[TranscriptionSegment]:
-        """Transcribe audio file using Hugging Face Whisper"""
+        """Transcribe audio file using faster-whisper"""
         try:
             logger.info(f"Transcribing audio file: {audio_file_path}")
-            
-            # Load audio file
+
             if not os.path.exists(audio_file_path):
                 raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
-            
-            # Load and preprocess audio
-            audio, sample_rate = librosa.load(audio_file_path, sr=16000)
-            
-            # Process audio in chunks for longer files
-            chunk_length = 30  # seconds
-            chunk_samples = chunk_length * sample_rate
-            
+
+            # faster-whisper decodes and resamples the file itself and handles
+            # long-audio chunking internally, so no librosa pass or manual
+            # 30-second window loop is needed
+            # vad_filter drops silent stretches (intros, dead air) before
+            # decoding, so only windows that contain speech pay for a forward
+            # pass
+            generated_segments, info = self.pipeline.transcribe(
+                audio_file_path,
+                beam_size=1,
+                batch_size=8,
+                vad_filter=True
+            )
+
             segments = []
-            
-            for i in range(0, len(audio), chunk_samples):
-                chunk = audio[i:i + chunk_samples]
-                start_time = i / sample_rate
-                end_time = min((i + len(chunk)) / sample_rate, len(audio) / sample_rate)
-                
-                # Process the chunk
-                inputs = self.processor(chunk, sampling_rate=16000, return_tensors="pt")
-                inputs = inputs.to(self.device)
-                
-                # Generate transcription
-                with torch.no_grad():
-                    predicted_ids = self.model.generate(inputs["input_features"])
-                
-                # Decode the transcription
-                transcription = self.processor.batch_decode(predicted_ids, skip_special_tokens=True)
-                text = transcription[0].strip()
-                
+
+            for segment in generated_segments:
+                text = segment.text.strip()
+
                 if text:  # Only add non-empty segments
                     segments.append(TranscriptionSegment(
-                        start_time=start_time,
-                        end_time=end_time,
+                        start_time=segment.start,
+                        end_time=segment.end,
                         text=text,
-                        confidence=0.9  # Whisper doesn't provide confidence scores directly
+                        confidence=0.9  # Same placeholder the previous backend used
                     ))
-            
+
             # Fallback for empty results
             if not segments:
                 segments.append(TranscriptionSegment(
                     start_time=0.0,
-                    end_time=len(audio) / sample_rate,
+                    end_time=info.duration,
                     text="No speech detected in audio.",
                     confidence=0.1
                 ))
-            
+
             logger.info(f"Transcription completed: {len(segments)} segments")
             return segments
-            
+
         except Exception as e:
             logger.error(f"Error transcribing audio: {str(e)}")
             # Fallback for testing
@@ -91,7 +103,7 @@ class TranscriptionService:
                 text="This is a test transcription. The actual audio transcription failed but the system is working.",
                 confidence=0.5
             )]
-    
+
     def get_full_text(self, segments: List[TranscriptionSegment]) -> str:
         """Combine all segments into full text"""
-        return " ".join([segment.text for segment in segments]) 
\ No newline at end of file
+        return " ".join(segment.text for segment in segments)
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import yt_dlp
 from typing import Tuple
@@ -11,43 +12,40 @@ class VideoProcessor:
         os.makedirs(temp_dir, exist_ok=True)
 
     def download_and_extract_audio(self, video_url: str) -> Tuple[str, float]:
-        """Download video and extract audio directly using yt-dlp (no MoviePy needed)"""
+        """Download the audio stream using yt-dlp (no MoviePy needed)
+
+        The downloaded container (m4a/webm/opus) is kept as-is: the
+        transcription backend decodes and resamples it directly, so
+        transcoding everything to WAV here would just be a second full
+        FFmpeg decode pass and a much larger temp file.
+        """
         try:
             # Generate output filename template
             output_template = os.path.join(self.temp_dir, '%(title)s.%(ext)s')
-            
+
             ydl_opts = {
                 'format': 'bestaudio/best',  # Get best audio quality
                 'outtmpl': output_template,
-                'extractaudio': True,
-                'audioformat': 'wav',
-                'audioquality': '192K',
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'wav',
-                    'preferredquality': '192',
-                }],
                 'no_warnings': True,
             }
-            
+
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 info = ydl.extract_info(video_url, download=True)
                 duration = info.get('duration', 0.0)
-                
+
                 # Get the final audio filename
-                filename = ydl.prepare_filename(info)
-                audio_filename = filename.rsplit('.', 1)[0] + '.wav'
-                
+                audio_filename = ydl.prepare_filename(info)
+
                 # Check if file exists, if not try alternative extensions
                 if not os.path.exists(audio_filename):
                     # Try different extensions that yt-dlp might have used
-                    base_name = filename.rsplit('.', 1)[0]
-                    for ext in ['.wav', '.m4a', '.mp3', '.webm']:
+                    base_name = audio_filename.rsplit('.', 1)[0]
+                    for ext in ['.m4a', '.webm', '.opus', '.mp3', '.wav']:
                         test_file = base_name + ext
                         if os.path.exists(test_file):
                             audio_filename = test_file
                             break
-                
+
             logger.info(f"Audio extracted: {audio_filename}, Duration: {duration}s")
             return audio_filename, duration
             
@@ -85,4 +83,13 @@ class VideoProcessor:
 
     def process_video_url(self, video_url: str) -> Tuple[str, float]:
         """Complete pipeline: download video and extract audio"""
-        return self.download_and_extract_audio(video_url) 
\ No newline at end of file
+        return self.download_and_extract_audio(video_url)
+
+    async def aprocess_video_url(self, video_url: str) -> Tuple[str, float]:
+        """Async variant of process_video_url
+
+        yt-dlp is blocking, so the download runs on a worker thread; the
+        event loop stays free to serve other requests while the network
+        transfer is in flight.
+        """
+        return await asyncio.to_thread(self.download_and_extract_audio, video_url) 
\ No newline at end of file